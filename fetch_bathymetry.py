@@ -18,18 +18,25 @@ to avoid the staircase artefacts that server-side interpolation produces
 on narrow diagonal channels.
 """
 
-import io
+import argparse
+import hashlib
 import json
 import os
+import shutil
 import sys
+import tempfile
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
 import fiona
 import numpy as np
 import requests
 import rasterio
-from rasterio.io import MemoryFile
-from rasterio.mask import mask as rio_mask
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from rasterio import features
+from rasterio.errors import RasterioError
 from rasterio.transform import from_bounds
 from rasterio.warp import reproject, Resampling
 from shapely.geometry import shape  # mapping unused while urban areas are commented out
@@ -45,6 +52,27 @@ WIDTH, HEIGHT = 3508, 4009
 
 NODATA = -9999.0
 
+# GeoTIFF creation options for both outputs: 256 px tiles, DEFLATE with the
+# floating-point predictor (best ratio for smooth depth surfaces)
+GTIFF_OPTIONS = {
+    "driver":     "GTiff",
+    "tiled":      True,
+    "blockxsize": 256,
+    "blockysize": 256,
+    "compress":   "deflate",
+    "predictor":  3,
+    "BIGTIFF":    "IF_SAFER",
+}
+
+# Shapefile sidecars actually needed to read a layer (.cpg carries the .dbf
+# encoding — without it non-ASCII place names are mis-decoded)
+SHAPEFILE_EXTS = (".shp", ".shx", ".dbf", ".prj", ".cpg")
+
+USER_AGENT = "oresund-bathymetry/1.0"
+
+CHUNK_SIZE = 1 << 20   # 1 MiB: HTTP stream and zip-extraction copy size
+DOWNLOAD_PARTS = 8     # concurrent byte ranges for large downloads
+
 # GSHHG full-resolution shoreline data (NOAA/SOEST)
 # https://www.ngdc.noaa.gov/mgg/shorelines/gshhs.html
 # Level 1 = ocean boundary (land polygons); "f" = full resolution
@@ -59,6 +87,7 @@ NE_POPULATED_PLACES_URL = (
     "https://naciscdn.org/naturalearth/10m/cultural/"
     "ne_10m_populated_places.zip"
 )
+NE_PP_FIELDS = ["NAME", "POP_MAX", "POP_MIN", "ADM0_A3", "FEATURECLA", "SCALERANK"]
 # OVERPASS_URL = "https://overpass-api.de/api/interpreter"
 
 # GeoNames country dumps — SE and DK cover the full Öresund strait
@@ -66,16 +95,40 @@ NE_POPULATED_PLACES_URL = (
 GEONAMES_BASE_URL  = "https://download.geonames.org/export/dump/"
 GEONAMES_COUNTRIES = ["SE", "DK"]
 
-DATA_DIR     = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
-TIFF_OUT     = os.path.join(DATA_DIR, "oresund_bathymetry.tif")
-TIFF_SEA_OUT = os.path.join(DATA_DIR, "oresund_bathymetry_sea.tif")
-LAND_OUT     = os.path.join(DATA_DIR, "oresund_land.geojson")
-GSHHG_SHP    = os.path.join(DATA_DIR, "GSHHS_f_L1.shp")
-NE_PP_SHP    = os.path.join(DATA_DIR, "ne_10m_populated_places.shp")
+DATA_DIR      = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+WCS_CACHE_DIR = os.path.join(DATA_DIR, "cache")
+TIFF_OUT      = os.path.join(DATA_DIR, "oresund_bathymetry.tif")
+TIFF_SEA_OUT  = os.path.join(DATA_DIR, "oresund_bathymetry_sea.tif")
+LAND_OUT      = os.path.join(DATA_DIR, "oresund_land.geojson")
+GSHHG_SHP     = os.path.join(DATA_DIR, "GSHHS_f_L1.shp")
+NE_PP_SHP     = os.path.join(DATA_DIR, "ne_10m_populated_places.shp")
 # OSM_URBAN_CACHE = os.path.join(DATA_DIR, "osm_urban_boundaries.geojson")
-PLACES_OUT   = os.path.join(DATA_DIR, "oresund_populated_places.geojson")
-# URBAN_OUT    = os.path.join(DATA_DIR, "oresund_urban_areas.geojson")
-TATORT_OUT   = os.path.join(DATA_DIR, "oresund_tatort_points.geojson")
+PLACES_OUT    = os.path.join(DATA_DIR, "oresund_populated_places.geojson")
+# URBAN_OUT   = os.path.join(DATA_DIR, "oresund_urban_areas.geojson")
+TATORT_OUT    = os.path.join(DATA_DIR, "oresund_tatort_points.geojson")
+
+
+def _make_session():
+    """One pooled HTTP session for every download, with retry on transient errors.
+
+    Keep-alive reuses TCP/TLS connections across requests to the same host
+    (the parallel range downloads especially). Retries back off on 429/5xx;
+    the final response is still returned so callers report the status.
+    """
+    retry = Retry(
+        total=5, backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False,
+        allowed_methods=("GET", "HEAD"),
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=DOWNLOAD_PARTS, max_retries=retry)
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _make_session()
 
 
 def _bbox_tuple():
@@ -83,24 +136,99 @@ def _bbox_tuple():
     return tuple(float(x) for x in parts)   # (min_lon, min_lat, max_lon, max_lat)
 
 
-def _overlaps_bbox(geom, min_lon, min_lat, max_lon, max_lat):
-    """True if a GeoJSON geometry dict's bounding box overlaps the target bbox."""
-    coords = []
-    if geom["type"] == "Polygon":
-        for ring in geom["coordinates"]:
-            coords.extend(ring)
-    elif geom["type"] == "MultiPolygon":
-        for polygon in geom["coordinates"]:
-            for ring in polygon:
-                coords.extend(ring)
-    if not coords:
-        return False
-    lons = [c[0] for c in coords]
-    lats = [c[1] for c in coords]
-    return (
-        max(lons) >= min_lon and min(lons) <= max_lon
-        and max(lats) >= min_lat and min(lats) <= max_lat
-    )
+def _write_geojson(path, feature_list, ensure_ascii=True):
+    """Write a list of GeoJSON features to path as a compact FeatureCollection.
+
+    json.dump streams through the pure-Python encoder; json.dumps takes the
+    C encoder's one-shot path, which matters for the large GSHHG polygons.
+    """
+    doc = {"type": "FeatureCollection", "features": feature_list}
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(doc, ensure_ascii=ensure_ascii, separators=(",", ":")))
+
+
+def _download_ranges(url, dest, size, timeout, parts):
+    """Fetch `size` bytes of url into dest as `parts` concurrent HTTP range requests.
+
+    dest is pre-sized and each worker writes its slice at the right offset
+    through its own file handle. Returns False if any range fails (a status
+    other than 206 Partial Content, a network error, or a short body); the
+    remaining workers then stop at their next chunk.
+    """
+    step = -(-size // parts)
+    spans = [(lo, min(lo + step, size) - 1) for lo in range(0, size, step)]
+    failed = threading.Event()
+
+    def fetch(span):
+        lo, hi = span
+        headers = {"Range": f"bytes={lo}-{hi}", "Accept-Encoding": "identity"}
+        offset = lo
+        try:
+            with SESSION.get(url, headers=headers, timeout=timeout, stream=True) as r, \
+                    open(dest, "r+b") as f:
+                if r.status_code == 206:
+                    f.seek(lo)
+                    for chunk in r.iter_content(CHUNK_SIZE):
+                        if failed.is_set():
+                            break
+                        f.write(chunk)
+                        offset += len(chunk)
+        except (requests.RequestException, OSError):
+            pass
+        if offset != hi + 1:
+            failed.set()
+            return False
+        return True
+
+    with open(dest, "wb") as f:
+        f.truncate(size)
+    with ThreadPoolExecutor(max_workers=len(spans)) as pool:
+        return all(list(pool.map(fetch, spans)))
+
+
+def _download(url, dest, timeout, parts=DOWNLOAD_PARTS):
+    """Download url to dest, in parallel byte ranges when the server allows it.
+
+    Falls back to a single stream if the server does not advertise
+    `Accept-Ranges: bytes`, does not report a length, or any range fails.
+    """
+    head = SESSION.head(url, timeout=timeout, allow_redirects=True)
+    size = int(head.headers.get("Content-Length", 0))
+    if (head.ok and head.headers.get("Accept-Ranges", "").lower() == "bytes"
+            and size > parts * CHUNK_SIZE):
+        if _download_ranges(head.url, dest, size, timeout, parts):
+            return
+        print("  Range download failed; falling back to a single stream")
+    r = SESSION.get(url, timeout=timeout, stream=True)
+    r.raise_for_status()
+    r.raw.decode_content = True
+    with open(dest, "wb") as f:
+        shutil.copyfileobj(r.raw, f, CHUNK_SIZE)
+
+
+def _download_and_extract(url, timeout, stem, extensions=SHAPEFILE_EXTS):
+    """Download a zip to a temp file in DATA_DIR and extract `stem` + each extension.
+
+    The archive is streamed to disk rather than held in memory, so peak RSS
+    stays flat regardless of zip size; members are copied out in chunks.
+    Raises FileNotFoundError if `stem + extensions[0]` is not in the archive.
+    """
+    fd, zip_path = tempfile.mkstemp(dir=DATA_DIR, suffix=".zip")
+    os.close(fd)
+    try:
+        _download(url, zip_path, timeout)
+        with zipfile.ZipFile(zip_path) as zf:
+            wanted = {stem + ext for ext in extensions}
+            members = {os.path.basename(m): m for m in zf.namelist()
+                       if os.path.basename(m) in wanted}
+            if stem + extensions[0] not in members:
+                raise FileNotFoundError(f"{stem + extensions[0]} not found in {url}")
+            for basename, member in members.items():
+                target = os.path.join(DATA_DIR, basename)
+                with zf.open(member) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+    finally:
+        os.remove(zip_path)
 
 
 def _ensure_ne(zip_url, shp_path, label, size_hint):
@@ -109,20 +237,8 @@ def _ensure_ne(zip_url, shp_path, label, size_hint):
         print(f"Using cached {label}: {shp_path}")
         return
     print(f"Downloading {label} ({size_hint}) …")
-    r = requests.get(zip_url, timeout=120, stream=True)
-    r.raise_for_status()
-    zip_data = io.BytesIO()
-    for chunk in r.iter_content(65536):
-        zip_data.write(chunk)
-    zip_data.seek(0)
     stem = os.path.splitext(os.path.basename(shp_path))[0]
-    with zipfile.ZipFile(zip_data) as zf:
-        for member in zf.namelist():
-            basename = os.path.basename(member)
-            if basename.startswith(stem + "."):
-                target = os.path.join(DATA_DIR, basename)
-                with zf.open(member) as src, open(target, "wb") as dst:
-                    dst.write(src.read())
+    _download_and_extract(zip_url, 120, stem)
     print(f"Extracted {stem} files → {DATA_DIR}")
 
 
@@ -132,19 +248,7 @@ def _ensure_gshhg():
         print(f"Using cached GSHHG shapefile: {GSHHG_SHP}")
         return
     print("Downloading GSHHG full-resolution shapefile (~150 MB) …")
-    r = requests.get(GSHHG_ZIP_URL, timeout=300, stream=True)
-    r.raise_for_status()
-    zip_data = io.BytesIO()
-    for chunk in r.iter_content(65536):
-        zip_data.write(chunk)
-    zip_data.seek(0)
-    with zipfile.ZipFile(zip_data) as zf:
-        for member in zf.namelist():
-            basename = os.path.basename(member)
-            if basename.startswith("GSHHS_f_L1."):
-                target = os.path.join(DATA_DIR, basename)
-                with zf.open(member) as src, open(target, "wb") as dst:
-                    dst.write(src.read())
+    _download_and_extract(GSHHG_ZIP_URL, 300, "GSHHS_f_L1")
     print(f"Extracted GSHHS_f_L1 files → {DATA_DIR}")
 
 
@@ -164,19 +268,55 @@ def _ensure_geonames(country_code):
         return txt_path
     url = f"{GEONAMES_BASE_URL}{country_code}.zip"
     print(f"Downloading GeoNames {country_code} data …")
-    r = requests.get(url, timeout=120, stream=True)
-    r.raise_for_status()
-    zip_data = io.BytesIO()
-    for chunk in r.iter_content(65536):
-        zip_data.write(chunk)
-    zip_data.seek(0)
-    with zipfile.ZipFile(zip_data) as zf:
-        with zf.open(f"{country_code}.txt") as src, open(txt_path, "wb") as dst:
-            dst.write(src.read())
+    _download_and_extract(url, 120, country_code, extensions=(".txt",))
     print(f"Extracted {country_code}.txt → {DATA_DIR}")
     return txt_path
 
 
+def _ensure_wcs(params, refresh=False):
+    """Fetch the EMODnet WCS GetCoverage GeoTIFF, cached in WCS_CACHE_DIR.
+
+    The cache key hashes the service URL and every request parameter, so a
+    change to BBOX, coverage or grid size fetches afresh. Returns the path
+    to the cached GeoTIFF.
+    """
+    key = hashlib.sha1(
+        json.dumps([WCS_URL, params], sort_keys=True).encode()
+    ).hexdigest()
+    cache_path = os.path.join(WCS_CACHE_DIR, f"wcs_{key}.tif")
+    if os.path.exists(cache_path) and not refresh:
+        # Decode the band, not just the header, so truncated pixel data is
+        # caught here rather than in step 1b (the coverage is only ~2 MB)
+        try:
+            with rasterio.open(cache_path) as ds:
+                ds.read(1)
+            valid = True
+        except RasterioError:
+            valid = False
+        if valid:
+            print(f"Using cached {COVERAGE} coverage: {cache_path}")
+            return cache_path
+        print(f"Cached coverage is unreadable, re-downloading: {cache_path}")
+
+    os.makedirs(WCS_CACHE_DIR, exist_ok=True)
+    print(f"Fetching {COVERAGE} from EMODnet WCS at native res  "
+          f"({params['width']} × {params['height']} px) …")
+    r = SESSION.get(WCS_URL, params=params, timeout=180, stream=True)
+
+    content_type = r.headers.get("Content-Type", "")
+    if r.status_code != 200 or "xml" in content_type.lower():
+        sys.exit(f"WCS error (HTTP {r.status_code}):\n{r.text[:500]}")
+
+    # Write beside the final path and rename, so an interrupted download
+    # never leaves a truncated file that a later run would trust.
+    part_path = cache_path + ".part"
+    r.raw.decode_content = True   # honour any Content-Encoding when reading raw
+    with open(part_path, "wb") as f:
+        shutil.copyfileobj(r.raw, f, CHUNK_SIZE)
+    os.replace(part_path, cache_path)
+    return cache_path
+
+
 # def _fetch_osm_urban():
 #     """Fetch OSM administrative city/town boundaries via Overpass API.
 #
@@ -199,7 +339,7 @@ def _ensure_geonames(country_code):
 #         "out geom;"
 #     )
 #     print("Fetching OSM administrative boundaries from Overpass API …")
-#     r = requests.post(OVERPASS_URL, data={"data": query}, timeout=90)
+#     r = SESSION.post(OVERPASS_URL, data={"data": query}, timeout=90)
 #     r.raise_for_status()
 #     data = r.json()
 #     with open(OSM_URBAN_CACHE, "w") as f:
@@ -208,7 +348,7 @@ def _ensure_geonames(country_code):
 #     return data
 
 
-def main():
+def main(refresh=False):
     os.makedirs(DATA_DIR, exist_ok=True)
     min_lon, min_lat, max_lon, max_lat = _bbox_tuple()
 
@@ -226,27 +366,18 @@ def main():
         "width":    native_w,
         "height":   native_h,
     }
-    print(f"Fetching {COVERAGE} from EMODnet WCS at native res  ({native_w} × {native_h} px) …")
-    r = requests.get(WCS_URL, params=params, timeout=180, stream=True)
-
-    content_type = r.headers.get("Content-Type", "")
-    if r.status_code != 200 or "xml" in content_type.lower():
-        sys.exit(f"WCS error (HTTP {r.status_code}):\n{r.text[:500]}")
-
-    raw_bytes = io.BytesIO()
-    for chunk in r.iter_content(65536):
-        raw_bytes.write(chunk)
-    raw_bytes.seek(0)
+    raw_path = _ensure_wcs(params, refresh=refresh)
 
     # --- 1b. Upsample to output resolution using Lanczos ---
     print(f"Resampling to {WIDTH} × {HEIGHT} px with Lanczos …")
     dst_transform = from_bounds(min_lon, min_lat, max_lon, max_lat, WIDTH, HEIGHT)
-    with MemoryFile(raw_bytes) as memfile:
-        with memfile.open() as src:
-            src_meta = src.meta.copy()
-            native_arr = src.read(1)
+    with rasterio.open(raw_path) as src:
+        src_meta = src.meta.copy()
+        native_arr = src.read(1, out_dtype=np.float32)
 
-    dst_arr = np.empty((HEIGHT, WIDTH), dtype=src_meta["dtype"])
+    # float32 throughout: depth needs nowhere near float64 precision, and it
+    # halves the bytes touched by the warp, mask and summary
+    dst_arr = np.empty((HEIGHT, WIDTH), dtype=np.float32)
     reproject(
         source=native_arr,
         destination=dst_arr,
@@ -257,10 +388,13 @@ def main():
         src_nodata=src_meta.get("nodata"),
         dst_nodata=src_meta.get("nodata"),
         resampling=Resampling.lanczos,
+        num_threads=os.cpu_count() or 1,   # GDAL splits the warp across cores
     )
 
     out_meta = src_meta.copy()
-    out_meta.update({"width": WIDTH, "height": HEIGHT, "transform": dst_transform})
+    out_meta.update({"width": WIDTH, "height": HEIGHT, "transform": dst_transform,
+                     "dtype": "float32"})
+    out_meta.update(GTIFF_OPTIONS)
     with rasterio.open(TIFF_OUT, "w", **out_meta) as ds:
         ds.write(dst_arr, 1)
     print(f"Saved GeoTIFF → {TIFF_OUT}  ({os.path.getsize(TIFF_OUT)//1024} KB)")
@@ -270,34 +404,40 @@ def main():
     print("Reading and clipping GSHHG land polygons …")
     land_shapes = []
     land_geojson_features = []
-    with fiona.open(GSHHG_SHP) as src:
-        for feat in src:
+    # OGR's spatial filter rejects non-intersecting polygons in C (envelope
+    # test, then an exact intersects), so only hits are converted to dicts.
+    # No attribute columns are read — only geometry is used.
+    with fiona.open(GSHHG_SHP, include_fields=[]) as src:
+        for feat in src.filter(bbox=(min_lon, min_lat, max_lon, max_lat)):
             geom = feat.geometry.__geo_interface__
-            if _overlaps_bbox(geom, min_lon, min_lat, max_lon, max_lat):
-                land_shapes.append(geom)
-                land_geojson_features.append(
-                    {"type": "Feature", "geometry": geom, "properties": {}}
-                )
-
-    clipped_land = {"type": "FeatureCollection", "features": land_geojson_features}
-    with open(LAND_OUT, "w") as f:
-        json.dump(clipped_land, f)
+            land_shapes.append(geom)
+            land_geojson_features.append(
+                {"type": "Feature", "geometry": geom, "properties": {}}
+            )
+
+    _write_geojson(LAND_OUT, land_geojson_features)
     print(f"Saved land polygons → {LAND_OUT}  ({len(land_shapes)} features)")
 
     # --- 3. Mask land out of the raster (keep sea only) ---
     print("Masking land cells …")
 
-    with rasterio.open(TIFF_OUT) as ds:
-        sea_image, sea_transform = rio_mask(
-            ds, land_shapes, invert=True, nodata=NODATA, filled=True
+    # TIFF_OUT is already written, so mask the in-memory array in place rather
+    # than reading the file back. Source nodata cells become NODATA as well.
+    sea_arr = dst_arr
+    src_nodata = out_meta.get("nodata")
+    if src_nodata is not None:
+        sea_arr[np.isnan(sea_arr) if np.isnan(src_nodata) else sea_arr == src_nodata] = NODATA
+    if land_shapes:
+        land = features.rasterize(
+            ((g, 1) for g in land_shapes), out_shape=sea_arr.shape,
+            transform=dst_transform, fill=0, dtype="uint8",
         )
-        meta = ds.meta.copy()
-
-    meta.update({"nodata": NODATA, "transform": sea_transform,
-                 "width": sea_image.shape[2], "height": sea_image.shape[1]})
+        sea_arr[land.view(bool)] = NODATA
 
+    meta = out_meta.copy()
+    meta.update({"nodata": NODATA})
     with rasterio.open(TIFF_SEA_OUT, "w", **meta) as ds:
-        ds.write(sea_image)
+        ds.write(sea_arr, 1)
     print(f"Saved masked GeoTIFF → {TIFF_SEA_OUT}  ({os.path.getsize(TIFF_SEA_OUT)//1024} KB)")
 
     # --- 4. Natural Earth populated places (point GeoJSON with attributes) ---
@@ -307,26 +447,24 @@ def main():
     )
     print("Reading and filtering populated places …")
     place_features = []
-    with fiona.open(NE_PP_SHP) as src:
-        for feat in src:
-            geom = feat.geometry.__geo_interface__
-            lon, lat = geom["coordinates"]
-            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat:
-                p = feat.properties
-                place_features.append({
-                    "type": "Feature",
-                    "geometry": geom,
-                    "properties": {
-                        "name":       p.get("NAME"),
-                        "pop_max":    p.get("POP_MAX"),
-                        "pop_min":    p.get("POP_MIN"),
-                        "adm0_a3":    p.get("ADM0_A3"),
-                        "featurecla": p.get("FEATURECLA"),
-                        "scalerank":  p.get("SCALERANK"),
-                    },
-                })
-    with open(PLACES_OUT, "w") as f:
-        json.dump({"type": "FeatureCollection", "features": place_features}, f)
+    # Bbox filter runs in OGR; only the six attributes we emit are read
+    # from the .dbf (the layer has well over a hundred columns).
+    with fiona.open(NE_PP_SHP, include_fields=NE_PP_FIELDS) as src:
+        for feat in src.filter(bbox=(min_lon, min_lat, max_lon, max_lat)):
+            p = feat.properties
+            place_features.append({
+                "type": "Feature",
+                "geometry": feat.geometry.__geo_interface__,
+                "properties": {
+                    "name":       p.get("NAME"),
+                    "pop_max":    p.get("POP_MAX"),
+                    "pop_min":    p.get("POP_MIN"),
+                    "adm0_a3":    p.get("ADM0_A3"),
+                    "featurecla": p.get("FEATURECLA"),
+                    "scalerank":  p.get("SCALERANK"),
+                },
+            })
+    _write_geojson(PLACES_OUT, place_features)
     print(f"Saved populated places → {PLACES_OUT}  ({len(place_features)} features)")
 
     # --- 5. GeoNames tätorter / populated place points (SE + DK) ---
@@ -363,9 +501,7 @@ def main():
                         "feature_code": fields[7],
                     },
                 })
-    with open(TATORT_OUT, "w", encoding="utf-8") as f:
-        json.dump({"type": "FeatureCollection", "features": tatort_features}, f,
-                  ensure_ascii=False)
+    _write_geojson(TATORT_OUT, tatort_features, ensure_ascii=False)
     print(f"Saved tätorter points → {TATORT_OUT}  ({len(tatort_features)} features)")
 
     # --- (OSM administrative city/town boundaries — commented out, approach not working) ---
@@ -398,11 +534,16 @@ def main():
     # print(f"Saved urban areas → {URBAN_OUT}  ({len(urban_features)} features)")
 
     # --- 6. Summary ---
-    with rasterio.open(TIFF_SEA_OUT) as ds:
-        depth = ds.read(1).astype(np.float64)
-    sea = depth[~np.isclose(depth, NODATA) & ~np.isnan(depth)]
-    print(f"\ndepth_m  min={sea.min():.1f}  max={sea.max():.1f}  mean={sea.mean():.1f}")
+    # NODATA is assigned exactly in step 3; isfinite also drops NaN/inf
+    sea = sea_arr[np.isfinite(sea_arr) & (sea_arr != NODATA)]
+    print(f"\ndepth_m  min={sea.min():.1f}  max={sea.max():.1f}  "
+          f"mean={sea.mean(dtype=np.float64):.1f}")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--refresh", action="store_true",
+        help="re-download the EMODnet coverage even if a cached copy exists",
+    )
+    main(refresh=parser.parse_args().refresh)